@@ -12,16 +12,33 @@ Version            :   1
 import asyncio
 import logging
 import os
+import time
 import traceback
+import uuid
 from pathlib import Path
 
 import uvicorn
+from brotli_asgi import BrotliMiddleware
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 
+from skypath_backend.constants import (
+    ADMIN_TOKEN,
+    COMPRESSION_MIN_SIZE,
+    PROFILE_DIR,
+    PROFILE_INTERVAL_MS,
+    PROFILE_MODE,
+    PROFILE_SLOW_MS,
+)
 from skypath_backend.core.health import default_router
+from skypath_backend.routes.admin_routes import admin_router
 from skypath_backend.routes.search_routes import search_router
-from skypath_backend.utils.flight_loader import load_flights_and_airports
+from skypath_backend.utils.flight_loader import (
+    build_routes_from,
+    compute_data_version,
+    load_flights_and_airports,
+)
+from skypath_backend.utils.profiling import ProfilingMiddleware
 
 logger = logging.getLogger("uvicorn")
 logger.setLevel(os.environ.get("LOG_LEVEL", "DEBUG"))
@@ -37,8 +54,50 @@ app = FastAPI(
     version="1.0",
 )
 
+# Brotli when the client accepts it, gzip otherwise
+app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+
+# Opt-in sampling profiler; added last so it wraps the whole stack, including compression
+if PROFILE_MODE != "off":
+    logger.info("Request profiling enabled: mode=%s, output=%s", PROFILE_MODE, PROFILE_DIR)
+    app.add_middleware(
+        ProfilingMiddleware,
+        mode=PROFILE_MODE,
+        slow_ms=PROFILE_SLOW_MS,
+        output_dir=PROFILE_DIR,
+        interval_ms=PROFILE_INTERVAL_MS,
+        token=ADMIN_TOKEN,
+    )
+    if not ADMIN_TOKEN:
+        logger.warning("ADMIN_TOKEN not set; X-Profile requests are ignored")
+
 app.include_router(default_router, tags=["Health Check"], prefix="")
 app.include_router(search_router, tags=["Search"], prefix=f"/v1/{SERVICE_NAME}")
+if ADMIN_TOKEN:
+    app.include_router(admin_router, tags=["Admin"], prefix=f"/v1/{SERVICE_NAME}")
+else:
+    logger.info("ADMIN_TOKEN not set; admin endpoints are disabled")
+
+
+def _set_flight_state(airport_map: dict, flights_from: dict, airports_list: list) -> None:
+    """Store loaded data and the structures derived from it; resets delta revisions."""
+    app.state.airport_map = airport_map
+    app.state.flights_from = flights_from
+    app.state.airports_list = airports_list
+    app.state.flight_index = {fl.flight_number: fl for flights in flights_from.values() for fl in flights}
+    app.state.routes_from = build_routes_from(flights_from)
+    # origin code -> delta sequence of the last delta touching its flights
+    app.state.origin_revisions = {}
+    app.state.delta_seq = 0
+    # delta_seq restarts at 0 in every process; the epoch makes revisions unique across restarts and replicas
+    app.state.delta_epoch = uuid.uuid4().hex[:12]
+
+
+def _set_empty_state() -> None:
+    """Initialize app state with no flight data (search returns empty results)."""
+    _set_flight_state({}, {}, [])
+    app.state.data_version = "empty"
+    app.state.data_last_modified = time.time()
 
 
 @app.on_event("startup")
@@ -58,20 +117,16 @@ async def startup_event() -> None:
             data_path = None
         if data_path is None or not data_path.exists():
             logger.warning("flights.json not found; search will return empty results")
-            app.state.airport_map = {}
-            app.state.flights_from = {}
-            app.state.airports_list = []
+            _set_empty_state()
             return
         airport_map, flights_from, airports_list = load_flights_and_airports(data_path)
-        app.state.airport_map = airport_map
-        app.state.flights_from = flights_from
-        app.state.airports_list = airports_list
+        _set_flight_state(airport_map, flights_from, airports_list)
+        app.state.data_version = compute_data_version(data_path)
+        app.state.data_last_modified = data_path.stat().st_mtime
         logger.info("Loaded %s airports, %s flight origins", len(airport_map), len(flights_from))
     except Exception as e:
         logger.warning("Flight data load failed: %s", str(e))
-        app.state.airport_map = {}
-        app.state.flights_from = {}
-        app.state.airports_list = []
+        _set_empty_state()
 
 
 @app.on_event("shutdown")
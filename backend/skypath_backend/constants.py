@@ -2,6 +2,7 @@
 Connection rules and shared constants for flight search.
 Responsibility: SkyPath Flight Connection Search.
 """
+import os
 
 # Layover rules (minutes) — per instructions
 MIN_LAYOVER_DOMESTIC_MIN = 45
@@ -11,3 +12,19 @@ MAX_LAYOVER_MIN = 6 * 60  # 6 hours
 # Search constraints
 MAX_STOPS = 2  # max 3 segments
 DATE_FORMAT = "%Y-%m-%d"
+
+# HTTP caching — Cache-Control values are overridable per deployment (e.g. CDN in front)
+AIRPORTS_CACHE_CONTROL = os.environ.get("AIRPORTS_CACHE_CONTROL", "public, max-age=3600")
+SEARCH_CACHE_CONTROL = os.environ.get("SEARCH_CACHE_CONTROL", "public, max-age=300")
+
+# Response compression (brotli, gzip fallback) — bodies smaller than this are sent as-is
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "500"))
+
+# Request profiling (opt-in): "off", "header" (only requests with X-Profile: <ADMIN_TOKEN>) or "all"
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "off")
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "200"))  # dump profiles of requests at least this slow
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "1"))  # stack sampling interval
+
+# Admin endpoints (schedule deltas) are only mounted when this token is set; send it as "Authorization: Bearer <token>"
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
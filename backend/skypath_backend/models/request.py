@@ -1,5 +1,6 @@
 """Request models for flight search API."""
 import re
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -22,3 +23,27 @@ class FlightSearchRequest(BaseModel):
         if not re.match(r"^\d{4}-\d{2}-\d{2}$", v):
             raise ValueError("date must be YYYY-MM-DD")
         return v
+
+
+class FlightDeltaOperation(BaseModel):
+    """One schedule change. Flight fields use the flights.json names; update merges only the fields given."""
+
+    op: Literal["add", "update", "remove"] = Field(..., description="add, update or remove")
+    flightNumber: str = Field(..., description="Flight identifier (e.g. SP101)")
+    airline: Optional[str] = None
+    origin: Optional[str] = Field(None, description="Origin airport IATA code (required for add)")
+    destination: Optional[str] = Field(None, description="Destination airport IATA code (required for add)")
+    departureTime: Optional[str] = Field(None, description="Local departure time, ISO 8601 (required for add)")
+    arrivalTime: Optional[str] = Field(None, description="Local arrival time, ISO 8601 (required for add)")
+    price: Optional[float] = Field(None, description="Price (required for add)")
+
+    @field_validator("origin", "destination")
+    @classmethod
+    def uppercase_code(cls, v: Optional[str]) -> Optional[str]:
+        return v.strip().upper() if v is not None else v
+
+
+class FlightDeltaRequest(BaseModel):
+    """Batch of schedule changes, validated as a whole and published in one step."""
+
+    operations: List[FlightDeltaOperation] = Field(..., min_length=1)
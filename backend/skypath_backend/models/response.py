@@ -36,3 +36,12 @@ class SearchResponse(BaseModel):
 
     itineraries: List[ItineraryResponse]
     total_count: int = Field(..., description="Total number of itineraries matching the search")
+
+
+class FlightDeltaResponse(BaseModel):
+    """Result of applying a schedule delta batch."""
+
+    added: int
+    updated: int
+    removed: int
+    affected_origins: List[str] = Field(..., description="Origins whose flight lists changed (their dependent searches are invalidated)")
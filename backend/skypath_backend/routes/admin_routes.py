@@ -0,0 +1,74 @@
+# Routes - SkyPath backend
+"""
+Admin endpoints for incremental schedule changes.
+
+POST /admin/flights/delta applies add/update/remove operations to the in-memory
+index without reloading flights.json. Every admin route requires
+"Authorization: Bearer <ADMIN_TOKEN>"; app.py does not mount this router at all
+when ADMIN_TOKEN is unset.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import secrets
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from skypath_backend.constants import ADMIN_TOKEN
+from skypath_backend.models.request import FlightDeltaRequest
+from skypath_backend.models.response import FlightDeltaResponse
+from skypath_backend.utils.flight_delta import apply_flight_delta
+
+
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """Reject requests without "Authorization: Bearer <ADMIN_TOKEN>" (constant-time comparison)."""
+    expected = f"Bearer {ADMIN_TOKEN}".encode("utf-8")
+    if not ADMIN_TOKEN or authorization is None or not secrets.compare_digest(authorization.encode("utf-8"), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+admin_router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+# Serializes delta batches; searches read the index lock-free
+_delta_lock = threading.Lock()
+
+
+@admin_router.post(
+    "/admin/flights/delta",
+    response_model=FlightDeltaResponse,
+    summary="Apply schedule delta",
+    description="Applies a batch of add/update/remove flight operations to the in-memory index. The batch is validated as a whole: any invalid operation returns 400 and nothing is applied; valid batches become visible to searches in one step. Only searches that can depart from an affected origin are invalidated.",
+)
+def apply_schedule_delta(request: Request, body: FlightDeltaRequest) -> JSONResponse | FlightDeltaResponse:
+    """Apply a delta batch and bump the revision of every origin whose flights changed."""
+    state = request.app.state
+    with _delta_lock:
+        try:
+            result = apply_flight_delta(
+                [op.model_dump() for op in body.operations],
+                airport_map=state.airport_map,
+                flights_from=state.flights_from,
+                flight_index=state.flight_index,
+                routes_from=state.routes_from,
+            )
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"detail": str(e)})
+        # Publish each map in one assignment, data before revisions: a search reads
+        # revisions first, so its ETag never labels data older than the revision.
+        state.flights_from = result.flights_from
+        state.routes_from = result.routes_from
+        if result.affected_origins:
+            state.delta_seq += 1
+            for origin in result.affected_origins:
+                state.origin_revisions[origin] = state.delta_seq
+    return FlightDeltaResponse(
+        added=result.added,
+        updated=result.updated,
+        removed=result.removed,
+        affected_origins=sorted(result.affected_origins),
+    )
@@ -5,25 +5,44 @@ Query params: origin, destination, date (ISO 8601 YYYY-MM-DD).
 Responsibility: SkyPath Flight Connection Search.
 """
 import re
+from functools import partial
 from typing import Any, List
 
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, Query, Request, Response
 from fastapi.responses import JSONResponse
 
+from skypath_backend.constants import AIRPORTS_CACHE_CONTROL, SEARCH_CACHE_CONTROL
 from skypath_backend.models.response import ItineraryResponse, SearchResponse
-from skypath_backend.utils.search import search_itineraries
+from skypath_backend.utils.http_cache import (
+    build_etag,
+    cache_headers,
+    is_not_modified,
+    not_modified_response,
+)
+from skypath_backend.utils.search import departure_airports, search_itineraries
+from skypath_backend.utils.single_flight import SingleFlight
 
 search_router = APIRouter()
 
+# Coalesces concurrent identical searches (same data version, origin, destination, date)
+search_flight = SingleFlight()
+
 
 @search_router.get(
     "/airports",
+    response_model=list,
     summary="List airports",
-    description="Returns list of airports (code, name, city, country) for dropdowns.",
+    description="Returns list of airports (code, name, city, country) for dropdowns. Supports ETag/Last-Modified revalidation.",
 )
-def list_airports(request: Request) -> list:
-    """Return airports list from app state."""
+def list_airports(request: Request, response: Response) -> list | Response:
+    """Return airports list from app state, or 304 if the client's copy is current."""
     state = request.app.state
+    last_modified = getattr(state, "data_last_modified", None)
+    etag = build_etag(getattr(state, "data_version", "empty"), "airports")
+    headers = cache_headers(etag, last_modified, AIRPORTS_CACHE_CONTROL)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+    response.headers.update(headers)
     airports = getattr(state, "airports_list", None) or []
     return airports
 
@@ -33,6 +52,24 @@ def _get_state(request: Request) -> Any:
     return request.app.state
 
 
+def _search_revision(state: Any, origin: str) -> int:
+    """
+    Return the latest delta sequence among airports a search from origin can depart from.
+
+    Schedule deltas only bump the origins they touch, so cached searches that
+    cannot reach a changed airport keep their ETag. The sequence is only
+    meaningful together with state.delta_epoch.
+    """
+    revisions = getattr(state, "origin_revisions", None) or {}
+    routes_from = getattr(state, "routes_from", None) or {}
+    if not revisions:
+        return 0
+    return max(
+        (revisions[code] for code in departure_airports(origin, routes_from) if code in revisions),
+        default=0,
+    )
+
+
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 
@@ -40,17 +77,24 @@ DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
     "/search",
     response_model=SearchResponse,
     summary="Search flight itineraries",
-    description="Returns valid itineraries (direct, 1-stop, 2-stop) sorted by total travel time. Supports pagination via page_number and page_size.",
+    description="Returns valid itineraries (direct, 1-stop, 2-stop) sorted by total travel time. Supports pagination via page_number and page_size, and ETag/Last-Modified revalidation.",
 )
-def search(
+async def search(
     request: Request,
+    response: Response,
     origin: str = Query(..., description="Origin airport IATA code (e.g. JFK)"),
     destination: str = Query(..., description="Destination airport IATA code (e.g. LAX)"),
     date: str = Query(..., description="Departure date (YYYY-MM-DD)"),
     page_number: int = Query(1, ge=1, description="Page number (starts from 1)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page (default 10, max 100)"),
-) -> JSONResponse | SearchResponse:
-    """Search itineraries by origin, destination, and date (query parameters). Pagination applied server-side."""
+) -> Response | SearchResponse:
+    """
+    Search itineraries by origin, destination, and date (query parameters). Pagination applied server-side.
+
+    Results are deterministic for a given data version, so conditional requests
+    with a matching validator get 304 without running the search. Concurrent
+    identical searches (any page) share one search_itineraries run on the threadpool.
+    """
     origin = origin.strip().upper()
     destination = destination.strip().upper()
 
@@ -67,7 +111,6 @@ def search(
 
     state = _get_state(request)
     airport_map = getattr(state, "airport_map", None) or {}
-    flights_from = getattr(state, "flights_from", None) or {}
 
     if origin not in airport_map:
         return JSONResponse(
@@ -80,16 +123,46 @@ def search(
             content={"detail": f"Invalid destination airport code: {destination}"},
         )
 
-    all_data: List[dict] = search_itineraries(
-        origin=origin,
-        destination=destination,
-        search_date=date,
-        flights_from=flights_from,
-    )
-    total_count = len(all_data)
     page_size = min(page_size, 100)
     page_number = max(page_number, 1)
+    revision = _search_revision(state, origin)
+    data_version = getattr(state, "data_version", "empty")
+    last_modified = getattr(state, "data_last_modified", None)
+    if revision:
+        data_version = f'{data_version}.{getattr(state, "delta_epoch", "")}.{revision}'
+        # Deltas live only in this process: a restart or another replica falls back to the
+        # file's mtime, so a date validator could not tell delta data apart. ETag only.
+        last_modified = None
+    etag = build_etag(data_version, "search", origin, destination, date, page_number, page_size)
+    headers = cache_headers(etag, last_modified, SEARCH_CACHE_CONTROL)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+
+    # Read after the revision: deltas publish data before bumping revisions
+    flights_from = getattr(state, "flights_from", None) or {}
+    all_data: List[dict] = await search_flight.do_async(
+        (data_version, origin, destination, date),
+        partial(
+            search_itineraries,
+            origin=origin,
+            destination=destination,
+            search_date=date,
+            flights_from=flights_from,
+        ),
+    )
+    total_count = len(all_data)
     offset = (page_number - 1) * page_size
     page_data = all_data[offset : offset + page_size]
     itineraries = [ItineraryResponse(**it) for it in page_data]
     return SearchResponse(itineraries=itineraries, total_count=total_count)
+
+
+@search_router.get(
+    "/search/metrics",
+    summary="Search coalescing metrics",
+    description="Returns single-flight counters: searches executed, requests coalesced onto an in-flight search, and searches currently in flight.",
+)
+def search_metrics() -> dict:
+    """Return single-flight counters for the search endpoint."""
+    return search_flight.stats()
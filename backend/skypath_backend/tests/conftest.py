@@ -4,10 +4,15 @@
 Pytest fixtures for SkyPath backend tests.
 Responsibility: SkyPath Flight Connection Search.
 """
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 
-from skypath_backend.app import app
+# Admin routes are only mounted when ADMIN_TOKEN is set at import time
+os.environ.setdefault("ADMIN_TOKEN", "test-admin-token")
+
+from skypath_backend.app import app  # noqa: E402
 
 
 @pytest.fixture(scope="module")
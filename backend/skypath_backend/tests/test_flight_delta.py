@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test cases for incremental schedule delta ingestion.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from skypath_backend.app import app
+from skypath_backend.constants import ADMIN_TOKEN
+from skypath_backend.utils.flight_delta import apply_flight_delta
+from skypath_backend.utils.flight_loader import build_routes_from, load_flights_and_airports
+from skypath_backend.utils.http_cache import http_date
+
+DATA_PATH = Path(__file__).resolve().parents[3] / "flights.json"
+DELTA_URL = "/v1/skypath/admin/flights/delta"
+SEARCH_URL = "/v1/skypath/search"
+DATE = "2024-03-15"
+ADMIN_HEADERS = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+NEW_JFK_LAX = {
+    "op": "add",
+    "flightNumber": "SP9001",
+    "airline": "SkyPath Airways",
+    "origin": "JFK",
+    "destination": "LAX",
+    "departureTime": "2024-03-15T12:00:00",
+    "arrivalTime": "2024-03-15T15:00:00",
+    "price": 199.0,
+}
+
+
+@pytest.fixture
+def index():
+    """Fresh (airport_map, flights_from, flight_index, routes_from) from flights.json."""
+    airport_map, flights_from, _ = load_flights_and_airports(DATA_PATH)
+    flight_index = {fl.flight_number: fl for flights in flights_from.values() for fl in flights}
+    return airport_map, flights_from, flight_index, build_routes_from(flights_from)
+
+
+@pytest.fixture
+def client():
+    """Function-scoped TestClient so every test starts from the unmodified dataset."""
+    with TestClient(app) as c:
+        yield c
+
+
+def _is_sorted(flights) -> bool:
+    return all(a.departure_utc <= b.departure_utc for a, b in zip(flights, flights[1:]))
+
+
+def _apply(index, operations):
+    """Apply operations and return (result, new flights_from, flight_index, new routes_from)."""
+    airport_map, flights_from, flight_index, routes_from = index
+    result = apply_flight_delta(operations, airport_map, flights_from, flight_index, routes_from)
+    return result, result.flights_from, flight_index, result.routes_from
+
+
+class TestApplyFlightDelta:
+    """apply_flight_delta keeps per-origin lists sorted and the derived structures in sync."""
+
+    def test_add_inserts_in_departure_order(self, index) -> None:
+        _, flights_from, _, routes_from = index
+        before = len(flights_from["JFK"])
+        lax_routes = routes_from["JFK"]["LAX"]
+        result, flights_from, flight_index, routes_from = _apply(index, [NEW_JFK_LAX])
+        assert result.added == 1
+        assert result.affected_origins == {"JFK"}
+        assert len(flights_from["JFK"]) == before + 1
+        assert _is_sorted(flights_from["JFK"])
+        assert flight_index["SP9001"] in flights_from["JFK"]
+        assert routes_from["JFK"]["LAX"] == lax_routes + 1
+
+    def test_update_merges_fields_and_keeps_order(self, index) -> None:
+        result, flights_from, flight_index, _ = _apply(index, [{
+            "op": "update",
+            "flightNumber": "SP101",
+            "departureTime": "2024-03-15T21:00:00",
+            "arrivalTime": "2024-03-16T00:15:00",
+        }])
+        assert result.updated == 1
+        updated = flight_index["SP101"]
+        assert updated.price == 299.0
+        assert updated.departure_local == "2024-03-15T21:00:00"
+        assert _is_sorted(flights_from["JFK"])
+        assert sum(fl.flight_number == "SP101" for fl in flights_from["JFK"]) == 1
+
+    def test_update_origin_moves_flight_between_lists(self, index) -> None:
+        result, flights_from, flight_index, routes_from = _apply(
+            index, [{"op": "update", "flightNumber": "SP101", "origin": "EWR"}]
+        )
+        assert result.affected_origins == {"JFK", "EWR"}
+        assert all(fl.flight_number != "SP101" for fl in flights_from["JFK"])
+        assert flight_index["SP101"] in flights_from["EWR"]
+        assert _is_sorted(flights_from["EWR"])
+        assert routes_from["EWR"]["LAX"] >= 1
+
+    def test_remove_drops_flight_and_route(self, index) -> None:
+        numbers = [fl.flight_number for fl in index[1]["JFK"] if fl.destination == "LAX"]
+        result, _, flight_index, routes_from = _apply(index, [{"op": "remove", "flightNumber": n} for n in numbers])
+        assert result.removed == len(numbers)
+        assert all(n not in flight_index for n in numbers)
+        assert "LAX" not in routes_from["JFK"]
+
+    def test_invalid_batch_is_not_applied(self, index) -> None:
+        _, flights_from, flight_index, _ = index
+        snapshot = list(flights_from["JFK"])
+        with pytest.raises(ValueError, match="operation 1"):
+            _apply(index, [NEW_JFK_LAX, {"op": "remove", "flightNumber": "NOPE"}])
+        assert flights_from["JFK"] == snapshot
+        assert "SP9001" not in flight_index
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {**NEW_JFK_LAX, "flightNumber": "SP101"},
+            {**NEW_JFK_LAX, "destination": "XXX"},
+            {**NEW_JFK_LAX, "price": None},
+            {"op": "update", "flightNumber": "SP101", "departureTime": "not-a-date"},
+            {"op": "update", "flightNumber": "SP101", "price": -5},
+            {"op": "update", "flightNumber": "SP101", "arrivalTime": "2024-03-14T00:00:00"},
+            {**NEW_JFK_LAX, "arrivalTime": "2024-03-15T08:00:00"},
+        ],
+    )
+    def test_invalid_operations_raise(self, index, operation) -> None:
+        with pytest.raises(ValueError):
+            _apply(index, [operation])
+
+    def test_published_index_is_not_mutated(self, index) -> None:
+        _, flights_from, _, routes_from = index
+        original = flights_from["JFK"]
+        snapshot = list(original)
+        routes_snapshot = {k: dict(v) for k, v in routes_from.items()}
+        _, new_flights_from, _, new_routes_from = _apply(index, [{"op": "update", "flightNumber": "SP101", "origin": "EWR"}])
+        assert new_flights_from is not flights_from and new_routes_from is not routes_from
+        assert flights_from["JFK"] is original and original == snapshot
+        assert routes_from == routes_snapshot
+        assert new_flights_from["LAX"] is flights_from["LAX"]
+
+
+class TestDeltaEndpoint:
+    """POST /admin/flights/delta and its effect on search results and validators."""
+
+    def test_added_flight_appears_in_search(self, client: TestClient) -> None:
+        params = {"origin": "JFK", "destination": "LAX", "date": DATE, "page_size": 100}
+        before = client.get(SEARCH_URL, params=params)
+        response = client.post(DELTA_URL, json={"operations": [NEW_JFK_LAX]}, headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        assert response.json() == {"added": 1, "updated": 0, "removed": 0, "affected_origins": ["JFK"]}
+        after = client.get(SEARCH_URL, params=params)
+        assert after.json()["total_count"] > before.json()["total_count"]
+        assert after.headers["etag"] != before.headers["etag"]
+        stale = client.get(SEARCH_URL, params=params, headers={"If-None-Match": before.headers["etag"]})
+        assert stale.status_code == 200
+
+    def test_unrelated_searches_keep_their_etag(self, client: TestClient) -> None:
+        params = {"origin": "JFK", "destination": "LAX", "date": DATE}
+        etag = client.get(SEARCH_URL, params=params).headers["etag"]
+        response = client.post(
+            DELTA_URL,
+            json={"operations": [{"op": "update", "flightNumber": "SP562", "price": 1.0}]},
+            headers=ADMIN_HEADERS,
+        )
+        assert response.json()["affected_origins"] == ["HKG"]
+        cached = client.get(SEARCH_URL, params=params, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+    def test_revisions_are_unique_across_restarts(self) -> None:
+        params = {"origin": "JFK", "destination": "LAX", "date": DATE, "page_size": 100}
+        price_update = {"op": "update", "flightNumber": "SP101"}
+        with TestClient(app) as first:
+            base_etag = first.get(SEARCH_URL, params=params).headers["etag"]
+            first.post(DELTA_URL, json={"operations": [{**price_update, "price": 1.0}]}, headers=ADMIN_HEADERS)
+            old_etag = first.get(SEARCH_URL, params=params).headers["etag"]
+        with TestClient(app) as restarted:
+            assert restarted.get(SEARCH_URL, params=params).headers["etag"] == base_etag
+            restarted.post(DELTA_URL, json={"operations": [{**price_update, "price": 999.0}]}, headers=ADMIN_HEADERS)
+            response = restarted.get(SEARCH_URL, params=params, headers={"If-None-Match": old_etag})
+            assert response.status_code == 200
+            assert response.headers["etag"] != old_etag
+            prices = {
+                seg["price"]
+                for it in response.json()["itineraries"]
+                for seg in it["segments"]
+                if seg["flightNumber"] == "SP101"
+            }
+            assert prices == {999.0}
+
+    def test_if_modified_since_never_keeps_delta_data_after_restart(self) -> None:
+        params = {"origin": "JFK", "destination": "LAX", "date": DATE, "page_size": 100}
+        later = http_date(time.time() + 60)
+        with TestClient(app) as first:
+            first.post(
+                DELTA_URL, json={"operations": [{"op": "update", "flightNumber": "SP101", "price": 1.0}]}, headers=ADMIN_HEADERS
+            )
+            delta = first.get(SEARCH_URL, params=params)
+            assert "last-modified" not in delta.headers
+            assert first.get(SEARCH_URL, params=params, headers={"If-Modified-Since": later}).status_code == 200
+        with TestClient(app) as restarted:
+            response = restarted.get(SEARCH_URL, params=params, headers={"If-None-Match": delta.headers["etag"]})
+            assert response.status_code == 200
+            assert "last-modified" in response.headers
+            prices = {
+                seg["price"]
+                for it in response.json()["itineraries"]
+                for seg in it["segments"]
+                if seg["flightNumber"] == "SP101"
+            }
+            assert 1.0 not in prices
+
+    @pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}, {"Authorization": ADMIN_TOKEN}])
+    def test_missing_or_wrong_token_returns_401(self, client: TestClient, headers: dict) -> None:
+        response = client.post(DELTA_URL, json={"operations": [NEW_JFK_LAX]}, headers=headers)
+        assert response.status_code == 401
+        search = client.get(SEARCH_URL, params={"origin": "JFK", "destination": "LAX", "date": DATE, "page_size": 100})
+        assert all(seg["flightNumber"] != "SP9001" for it in search.json()["itineraries"] for seg in it["segments"])
+
+    def test_admin_routes_not_mounted_without_token(self) -> None:
+        env = {k: v for k, v in os.environ.items() if k != "ADMIN_TOKEN"}
+        env["PYTHONPATH"] = str(Path(__file__).resolve().parents[2])
+        paths = subprocess.run(
+            [sys.executable, "-c", "from skypath_backend.app import app; print([r.path for r in app.routes])"],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        assert "/v1/skypath/search" in paths
+        assert DELTA_URL not in paths
+
+    def test_invalid_delta_returns_400(self, client: TestClient) -> None:
+        response = client.post(DELTA_URL, json={"operations": [{"op": "remove", "flightNumber": "NOPE"}]}, headers=ADMIN_HEADERS)
+        assert response.status_code == 400
+        assert "NOPE" in response.json()["detail"]
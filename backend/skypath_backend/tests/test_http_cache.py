@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test cases for HTTP caching (ETag / Last-Modified / 304) and response compression.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from skypath_backend.app import app
+
+AIRPORTS_URL = "/v1/skypath/airports"
+SEARCH_URL = "/v1/skypath/search"
+SEARCH_PARAMS = {"origin": "JFK", "destination": "LAX", "date": "2024-03-15"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient; startup loads flights.json."""
+    with TestClient(app) as c:
+        yield c
+
+
+class TestHttpCaching:
+    """Validators, conditional requests and compression on /airports and /search."""
+
+    def test_airports_sends_validators(self, client: TestClient) -> None:
+        response = client.get(AIRPORTS_URL)
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        assert "last-modified" in response.headers
+        assert "max-age" in response.headers["cache-control"]
+
+    def test_airports_if_none_match_returns_304(self, client: TestClient) -> None:
+        etag = client.get(AIRPORTS_URL).headers["etag"]
+        response = client.get(AIRPORTS_URL, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_airports_if_modified_since_returns_304(self, client: TestClient) -> None:
+        last_modified = client.get(AIRPORTS_URL).headers["last-modified"]
+        response = client.get(AIRPORTS_URL, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    def test_search_if_none_match_returns_304(self, client: TestClient) -> None:
+        first = client.get(SEARCH_URL, params=SEARCH_PARAMS)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        response = client.get(SEARCH_URL, params=SEARCH_PARAMS, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_search_etag_depends_on_request_key(self, client: TestClient) -> None:
+        page_1 = client.get(SEARCH_URL, params={**SEARCH_PARAMS, "page_size": 2})
+        page_2 = client.get(SEARCH_URL, params={**SEARCH_PARAMS, "page_size": 2, "page_number": 2})
+        assert page_1.headers["etag"] != page_2.headers["etag"]
+        stale = client.get(
+            SEARCH_URL,
+            params={**SEARCH_PARAMS, "page_size": 2, "page_number": 2},
+            headers={"If-None-Match": page_1.headers["etag"]},
+        )
+        assert stale.status_code == 200
+
+    def test_search_etag_ignores_code_case(self, client: TestClient) -> None:
+        upper = client.get(SEARCH_URL, params=SEARCH_PARAMS)
+        lower = client.get(SEARCH_URL, params={**SEARCH_PARAMS, "origin": "jfk", "destination": "lax"})
+        assert upper.headers["etag"] == lower.headers["etag"]
+
+    def test_search_errors_are_not_cacheable(self, client: TestClient) -> None:
+        response = client.get(SEARCH_URL, params={**SEARCH_PARAMS, "origin": "XXX"})
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+    @pytest.mark.parametrize("encoding", ["br", "gzip"])
+    def test_responses_are_compressed(self, client: TestClient, encoding: str) -> None:
+        response = client.get(SEARCH_URL, params=SEARCH_PARAMS, headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == encoding
+        assert "itineraries" in response.json()
+
+    def test_vary_on_every_cacheable_response(self, client: TestClient) -> None:
+        identity = client.get(SEARCH_URL, params=SEARCH_PARAMS, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        compressed = client.get(SEARCH_URL, params=SEARCH_PARAMS, headers={"Accept-Encoding": "br"})
+        revalidated = client.get(SEARCH_URL, params=SEARCH_PARAMS, headers={"If-None-Match": identity.headers["etag"]})
+        airports = client.get(AIRPORTS_URL, headers={"Accept-Encoding": "identity"})
+        assert revalidated.status_code == 304
+        for response in (identity, compressed, revalidated, airports):
+            assert "accept-encoding" in response.headers["vary"].lower()
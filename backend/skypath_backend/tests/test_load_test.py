@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Smoke tests for the in-process load-test harness.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from skypath_backend.app import app
+from skypath_backend.tools.load_test import (
+    DEFAULT_PREFIX,
+    ERROR_PATH,
+    LevelResult,
+    build_request_plan,
+    format_report,
+    main,
+    run_load,
+)
+
+MIX = {"search": 0.4, "invalid_airport": 0.2, "validation": 0.2, "server_error": 0.2}
+
+
+class TestLoadHarness:
+    """The harness drives the real app and reports per-level statistics."""
+
+    def test_request_plan_is_seeded(self) -> None:
+        routes = [("JFK", "LAX"), ("BOS", "SEA")]
+        plan = build_request_plan(50, routes, "2024-03-15", MIX, max_page=2, seed=7)
+        assert plan == build_request_plan(50, routes, "2024-03-15", MIX, max_page=2, seed=7)
+        assert {kind for kind, _, _ in plan} == set(MIX)
+        for kind, path, params in plan:
+            if kind == "search":
+                assert 1 <= params["page_number"] <= 2
+            elif kind == "invalid_airport":
+                assert params["origin"] == "XXX"
+            elif kind == "validation":
+                assert "date" not in params or params.get("page_size") == 500 or params["page_number"] == 0
+            else:
+                assert path == ERROR_PATH
+
+    def test_empty_mix_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            build_request_plan(10, [("JFK", "LAX")], "2024-03-15", {"search": 0}, max_page=1, seed=0)
+
+    def test_url_run_with_only_server_errors_is_rejected(self, capsys: pytest.CaptureFixture) -> None:
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--url", "http://localhost:9090", "--mix", "server_error=1"])
+        assert exc_info.value.code == 2
+        assert "server_error" in capsys.readouterr().err
+
+    def test_percentile_nearest_rank(self) -> None:
+        result = LevelResult(concurrency=1, duration_s=1.0, latencies_ms=[float(i) for i in range(1, 101)])
+        assert result.percentile(50) == 50.0
+        assert result.percentile(99) == 99.0
+        assert result.percentile(100) == 100.0
+        assert result.throughput == 100.0
+
+    def test_run_load_in_process(self) -> None:
+        results = asyncio.run(run_load(concurrency_levels=[1, 4], requests_per_level=40, mix=MIX))
+        assert [r.concurrency for r in results] == [1, 4]
+        for r in results:
+            assert len(r.latencies_ms) == 40
+            assert r.transport_errors == 0
+            assert r.coalesced is not None
+            assert set(r.kind_status_counts["search"]) == {200}
+            assert set(r.kind_status_counts["invalid_airport"]) == {400}
+            assert set(r.kind_status_counts["validation"]) == {422}
+            assert set(r.kind_status_counts["server_error"]) == {500}
+        report = format_report(results)
+        assert "req/s" in report
+        for kind in MIX:
+            assert kind in report
+        assert all(getattr(route, "path", None) != DEFAULT_PREFIX + ERROR_PATH for route in app.routes)
+
+    def test_prefix_follows_service_name(self) -> None:
+        env = {**os.environ, "SERVICE_NAME": "flights", "PYTHONPATH": str(Path(__file__).resolve().parents[2])}
+        report = subprocess.run(
+            [sys.executable, "-m", "skypath_backend.tools.load_test", "--concurrency", "2", "--requests", "40"],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        assert "search" in report and "200:" in report
+        assert "404" not in report
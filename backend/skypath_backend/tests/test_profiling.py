@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test cases for the opt-in request profiling middleware.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from skypath_backend.utils.profiling import PROFILE_FILE_HEADER, ProfilingMiddleware
+
+TOKEN = "profile-token"
+
+
+def _busy_work() -> int:
+    """Burn CPU for ~50 ms so the sampler sees this frame."""
+    deadline = time.perf_counter() + 0.05
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def _spin_a() -> None:
+    deadline = time.perf_counter() + 0.001
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _spin_b() -> None:
+    deadline = time.perf_counter() + 0.001
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _make_client(tmp_path: Path, mode: str, slow_ms: float) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware, mode=mode, slow_ms=slow_ms, output_dir=str(tmp_path), interval_ms=1, token=TOKEN
+    )
+
+    @app.get("/work")
+    def work() -> dict:
+        return {"n": _busy_work()}
+
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+    """Profiles are taken on request and written in folded-stack format."""
+
+    def test_header_mode_profiles_requested_requests(self, tmp_path: Path) -> None:
+        client = _make_client(tmp_path, mode="header", slow_ms=10_000)
+        response = client.get("/work", headers={"X-Profile": TOKEN})
+        assert response.status_code == 200
+        name = response.headers[PROFILE_FILE_HEADER]
+        assert "/" not in name
+        profile = tmp_path / name
+        lines = profile.read_text().splitlines()
+        assert lines
+        _, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any("_busy_work" in line for line in lines)
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Profile": "1"}, {"X-Profile": "wrong"}])
+    def test_header_mode_ignores_other_requests(self, tmp_path: Path, headers: dict) -> None:
+        client = _make_client(tmp_path, mode="header", slow_ms=0)
+        response = client.get("/work", headers=headers)
+        assert PROFILE_FILE_HEADER not in response.headers
+        assert not list(tmp_path.iterdir())
+
+    def test_header_is_ignored_without_token(self, tmp_path: Path) -> None:
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, mode="all", slow_ms=10_000, output_dir=str(tmp_path), interval_ms=1)
+
+        @app.get("/work")
+        def work() -> dict:
+            return {"n": _busy_work()}
+
+        response = TestClient(app).get("/work", headers={"X-Profile": ""})
+        assert PROFILE_FILE_HEADER not in response.headers
+        assert not list(tmp_path.iterdir())
+
+    def test_all_mode_writes_only_slow_requests(self, tmp_path: Path) -> None:
+        fast = _make_client(tmp_path, mode="all", slow_ms=10_000).get("/work")
+        assert PROFILE_FILE_HEADER not in fast.headers
+        slow = _make_client(tmp_path, mode="all", slow_ms=1).get("/work")
+        assert (tmp_path / slow.headers[PROFILE_FILE_HEADER]).exists()
+
+    def test_concurrent_profiles_only_contain_their_own_loop_work(self, tmp_path: Path) -> None:
+        app = FastAPI()
+        app.add_middleware(
+            ProfilingMiddleware, mode="header", slow_ms=0, output_dir=str(tmp_path), interval_ms=1, token=TOKEN
+        )
+
+        @app.get("/a")
+        async def route_a() -> dict:
+            for _ in range(100):
+                _spin_a()
+                await asyncio.sleep(0)
+            return {}
+
+        @app.get("/b")
+        async def route_b() -> dict:
+            for _ in range(100):
+                _spin_b()
+                await asyncio.sleep(0)
+            return {}
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    client.get("/a", headers={"X-Profile": TOKEN}),
+                    client.get("/b", headers={"X-Profile": TOKEN}),
+                )
+
+        # Short GIL switch interval so the sampler is not phase-locked to the spin loops
+        previous = sys.getswitchinterval()
+        sys.setswitchinterval(0.0002)
+        try:
+            response_a, response_b = asyncio.run(run())
+        finally:
+            sys.setswitchinterval(previous)
+        profile_a = (tmp_path / response_a.headers[PROFILE_FILE_HEADER]).read_text()
+        profile_b = (tmp_path / response_b.headers[PROFILE_FILE_HEADER]).read_text()
+        assert "_spin_a" in profile_a and "_spin_b" not in profile_a
+        assert "_spin_b" in profile_b and "_spin_a" not in profile_b
+        assert "skypath-profiler" not in profile_a + profile_b
+
+    def test_invalid_mode_is_rejected(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            _make_client(tmp_path, mode="sometimes", slow_ms=0).get("/work")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test cases for single-flight coalescing of identical concurrent searches.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from skypath_backend.app import app
+from skypath_backend.utils.single_flight import SingleFlight
+
+METRICS_URL = "/v1/skypath/search/metrics"
+SEARCH_URL = "/v1/skypath/search"
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient; startup loads flights.json."""
+    with TestClient(app) as c:
+        yield c
+
+
+def _slow_counter():
+    """Return (fn, calls) where fn sleeps briefly and counts its invocations."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["result"]
+
+    return fn, calls
+
+
+class TestSingleFlight:
+    """SingleFlight behaviour on the sync (threads) and async (event loop) paths."""
+
+    def test_sync_concurrent_calls_share_one_execution(self) -> None:
+        flight = SingleFlight()
+        fn, calls = _slow_counter()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: flight.do("k", fn), range(8)))
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        stats = flight.stats()
+        assert stats == {"executions": 1, "coalesced": 7, "in_flight": 0}
+
+    def test_async_concurrent_calls_share_one_execution(self) -> None:
+        flight = SingleFlight()
+        fn, calls = _slow_counter()
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async("k", fn) for _ in range(8)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert flight.stats()["coalesced"] == 7
+
+    def test_different_keys_do_not_coalesce(self) -> None:
+        flight = SingleFlight()
+        fn, calls = _slow_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda k: flight.do(k, fn), ["a", "b"]))
+        assert len(calls) == 2
+        assert flight.stats()["coalesced"] == 0
+
+    def test_sequential_calls_recompute(self) -> None:
+        flight = SingleFlight()
+        fn, calls = _slow_counter()
+        flight.do("k", fn)
+        flight.do("k", fn)
+        assert len(calls) == 2
+
+    def test_exception_is_shared_and_key_released(self) -> None:
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def boom():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        def call():
+            with pytest.raises(ValueError):
+                flight.do("k", boom)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        call()
+        leader.join()
+        assert flight.stats() == {"executions": 1, "coalesced": 1, "in_flight": 0}
+        assert flight.do("k", lambda: "ok") == "ok"
+
+    def test_cancelled_leader_does_not_cancel_waiters(self) -> None:
+        flight = SingleFlight()
+        fn, calls = _slow_counter()
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do_async("k", fn))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.ensure_future(flight.do_async("k", fn))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await waiter
+
+        assert asyncio.run(run()) == ["result"]
+        assert len(calls) == 1
+
+    def test_cancelled_leader_failure_is_observed(self) -> None:
+        flight = SingleFlight()
+        unhandled = []
+
+        def boom():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(lambda _, context: unhandled.append(context))
+            leader = asyncio.ensure_future(flight.do_async("k", boom))
+            await asyncio.sleep(0.02)
+            leader.cancel()
+            await asyncio.sleep(0.2)
+            gc.collect()
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert unhandled == []
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestSearchCoalescingMetrics:
+    """Metrics endpoint for search coalescing."""
+
+    def test_metrics_endpoint_counts_searches(self, client: TestClient) -> None:
+        before = client.get(METRICS_URL).json()
+        assert set(before) == {"executions", "coalesced", "in_flight"}
+        response = client.get(SEARCH_URL, params={"origin": "JFK", "destination": "LAX", "date": "2024-03-16"})
+        assert response.status_code == 200
+        after = client.get(METRICS_URL).json()
+        assert after["executions"] == before["executions"] + 1
+        assert after["in_flight"] == 0
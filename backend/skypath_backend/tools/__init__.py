@@ -0,0 +1 @@
+# Tools - SkyPath backend (responsibility: SkyPath Flight Connection Search)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Load-generation harness for the full HTTP path (routing, validation, search,
+Pydantic serialization, compression, error handling).
+
+Runs an async httpx client at increasing concurrency levels and reports
+throughput and latency percentiles per level, overall and per request kind:
+
+- search:          valid searches over the given routes and pages
+- invalid_airport: unknown origin, answered by the route's own 400
+- validation:      query validation failures (missing param, page_size=500,
+                   page_number=0), answered by FastAPI's 422 handler
+- server_error:    a request that raises into the app's global exception
+                   handler (500). Nothing in the API raises on bad input, so
+                   in-process runs mount a load-test-only route that raises
+                   and remove it when the run ends. A served app never has
+                   it, so --url runs skip this kind.
+
+By default the app runs in-process over ASGI (no sockets); pass --url to
+target a running uvicorn.
+
+    PYTHONPATH=. python3 -m skypath_backend.tools.load_test --concurrency 1,8,32,128 --requests 500
+    PYTHONPATH=. python3 -m skypath_backend.tools.load_test --url http://localhost:9090
+
+Responsibility: SkyPath Flight Connection Search.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from fastapi.routing import APIRoute
+
+# Paths are relative to the API prefix, which app.py builds from SERVICE_NAME
+DEFAULT_PREFIX = f'/v1/{os.environ.get("SERVICE_NAME", "skypath")}'
+SEARCH_PATH = "/search"
+METRICS_PATH = "/search/metrics"
+ERROR_PATH = "/_loadtest/error"
+DEFAULT_DATE = "2024-03-15"
+# instructions.md test routes: mix of direct, multi-stop, international and date-line searches
+DEFAULT_ROUTES: List[Tuple[str, str]] = [("JFK", "LAX"), ("SFO", "NRT"), ("BOS", "SEA"), ("SYD", "LAX")]
+REQUEST_KINDS = ("search", "invalid_airport", "validation", "server_error")
+DEFAULT_MIX: Dict[str, float] = {"search": 0.85, "invalid_airport": 0.05, "validation": 0.05, "server_error": 0.05}
+
+
+def _percentile(latencies_ms: List[float], pct: float) -> float:
+    """Nearest-rank latency percentile in milliseconds."""
+    if not latencies_ms:
+        return 0.0
+    ordered = sorted(latencies_ms)
+    rank = max(int(round(pct / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+@dataclass
+class LevelResult:
+    """Measurements for one concurrency level."""
+
+    concurrency: int
+    duration_s: float
+    latencies_ms: List[float]
+    status_counts: Counter = field(default_factory=Counter)
+    transport_errors: int = 0
+    coalesced: Optional[int] = None
+    kind_latencies_ms: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    kind_status_counts: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return len(self.latencies_ms) / self.duration_s if self.duration_s else 0.0
+
+    def percentile(self, pct: float, kind: Optional[str] = None) -> float:
+        """Nearest-rank latency percentile in milliseconds, overall or for one request kind."""
+        return _percentile(self.latencies_ms if kind is None else self.kind_latencies_ms.get(kind, []), pct)
+
+
+def build_request_plan(
+    total: int,
+    routes: Sequence[Tuple[str, str]],
+    date: str,
+    mix: Dict[str, float],
+    max_page: int,
+    seed: int,
+) -> List[Tuple[str, str, dict]]:
+    """
+    Build the (kind, path, query params) of each request of a level.
+
+    Kinds are drawn with the weights in mix (see REQUEST_KINDS); valid and
+    invalid-airport searches pick a random route and page.
+
+    Raises:
+        ValueError: If no request kind in mix has a positive weight.
+    """
+    rng = random.Random(seed)
+    kinds = [k for k in REQUEST_KINDS if mix.get(k, 0) > 0]
+    if not kinds:
+        raise ValueError("request mix has no kind with a positive weight")
+    weights = [mix[k] for k in kinds]
+    plan = []
+    for kind in rng.choices(kinds, weights=weights, k=total):
+        origin, destination = rng.choice(routes)
+        params = {"origin": origin, "destination": destination, "date": date, "page_number": rng.randint(1, max_page)}
+        if kind == "invalid_airport":
+            params["origin"] = "XXX"
+        elif kind == "validation":
+            variant = rng.choice(("missing_date", "page_size", "page_number"))
+            if variant == "missing_date":
+                del params["date"]
+            elif variant == "page_size":
+                params["page_size"] = 500
+            else:
+                params["page_number"] = 0
+        elif kind == "server_error":
+            plan.append((kind, ERROR_PATH, {}))
+            continue
+        plan.append((kind, SEARCH_PATH, params))
+    return plan
+
+
+async def _coalesced_count(client: httpx.AsyncClient) -> Optional[int]:
+    try:
+        response = await client.get(METRICS_PATH)
+        return response.json().get("coalesced")
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+async def run_level(client: httpx.AsyncClient, plan: List[Tuple[str, str, dict]], concurrency: int) -> LevelResult:
+    """Send every request in plan using `concurrency` concurrent workers."""
+    result = LevelResult(concurrency=concurrency, duration_s=0.0, latencies_ms=[])
+    queue = iter(plan)
+    coalesced_before = await _coalesced_count(client)
+
+    async def worker() -> None:
+        for kind, path, params in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+            except httpx.HTTPError:
+                result.transport_errors += 1
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            result.latencies_ms.append(elapsed_ms)
+            result.status_counts[response.status_code] += 1
+            result.kind_latencies_ms[kind].append(elapsed_ms)
+            result.kind_status_counts[kind][response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration_s = time.perf_counter() - start
+
+    coalesced_after = await _coalesced_count(client)
+    if coalesced_before is not None and coalesced_after is not None:
+        result.coalesced = coalesced_after - coalesced_before
+    return result
+
+
+def _mount_error_route(app, prefix: str) -> APIRoute:
+    """Add a route that raises into the global exception handler and return it, so it can be removed."""
+
+    def loadtest_error() -> None:
+        raise RuntimeError("load-test injected error")
+
+    app.add_api_route(prefix + ERROR_PATH, loadtest_error, methods=["GET"], include_in_schema=False)
+    return app.router.routes[-1]
+
+
+async def run_load(
+    concurrency_levels: Sequence[int],
+    requests_per_level: int,
+    url: Optional[str] = None,
+    routes: Sequence[Tuple[str, str]] = DEFAULT_ROUTES,
+    date: str = DEFAULT_DATE,
+    mix: Optional[Dict[str, float]] = None,
+    max_page: int = 3,
+    seed: int = 0,
+    prefix: str = DEFAULT_PREFIX,
+) -> List[LevelResult]:
+    """
+    Run one level per concurrency value and return their results.
+
+    Args:
+        concurrency_levels: Concurrent worker counts, run in the given order.
+        requests_per_level: Requests sent at each level.
+        url: Base URL of a running server; None runs the app in-process over ASGI.
+        routes: (origin, destination) pairs to search.
+        date: Search date for every request.
+        mix: Weight per request kind (default DEFAULT_MIX); server_error is dropped for --url runs.
+        max_page: Requests use a random page_number in [1, max_page].
+        seed: Seed for the request plan, so runs are comparable.
+        prefix: API path prefix, "/v1/<SERVICE_NAME>" of the target app.
+
+    Returns:
+        One LevelResult per concurrency level.
+    """
+    mix = dict(DEFAULT_MIX if mix is None else mix)
+    results = []
+    if url is not None:
+        mix.pop("server_error", None)
+        limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+        async with httpx.AsyncClient(base_url=url.rstrip("/") + prefix, limits=limits, timeout=60.0) as client:
+            for level in concurrency_levels:
+                plan = build_request_plan(requests_per_level, routes, date, mix, max_page, seed)
+                results.append(await run_level(client, plan, level))
+        return results
+
+    from skypath_backend.app import app
+
+    # Mounted on the shared app object only for this run; removed again in the finally block
+    error_route = _mount_error_route(app, prefix)
+    # The global handler logs every injected error with a traceback; keep it out of the report
+    uvicorn_logger = logging.getLogger("uvicorn")
+    previous_level = uvicorn_logger.level
+    uvicorn_logger.setLevel(logging.CRITICAL)
+    try:
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://skypath" + prefix, timeout=60.0) as client:
+                for level in concurrency_levels:
+                    plan = build_request_plan(requests_per_level, routes, date, mix, max_page, seed)
+                    results.append(await run_level(client, plan, level))
+        finally:
+            await app.router.shutdown()
+    finally:
+        app.router.routes.remove(error_route)
+        uvicorn_logger.setLevel(previous_level)
+    return results
+
+
+def format_report(results: Sequence[LevelResult]) -> str:
+    """Render one row per concurrency level, followed by a per-kind breakdown of each level."""
+    header = (
+        f"{'conc':>5} {'reqs':>6} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8} {'5xx':>6} {'coalesced':>9}  status"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        errors = r.transport_errors + sum(n for code, n in r.status_counts.items() if code >= 500)
+        statuses = " ".join(f"{code}:{n}" for code, n in sorted(r.status_counts.items()))
+        coalesced = "-" if r.coalesced is None else str(r.coalesced)
+        lines.append(
+            f"{r.concurrency:>5} {len(r.latencies_ms):>6} {r.throughput:>9.1f} {r.percentile(50):>8.1f} "
+            f"{r.percentile(90):>8.1f} {r.percentile(99):>8.1f} {r.percentile(100):>8.1f} "
+            f"{errors:>6} {coalesced:>9}  {statuses}"
+        )
+
+    kind_header = f"{'conc':>5} {'kind':<16} {'reqs':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}  status"
+    lines += ["", kind_header, "-" * len(kind_header)]
+    for r in results:
+        for kind in REQUEST_KINDS:
+            latencies = r.kind_latencies_ms.get(kind)
+            if not latencies:
+                continue
+            statuses = " ".join(f"{code}:{n}" for code, n in sorted(r.kind_status_counts[kind].items()))
+            lines.append(
+                f"{r.concurrency:>5} {kind:<16} {len(latencies):>6} {r.percentile(50, kind):>8.1f} "
+                f"{r.percentile(99, kind):>8.1f} {r.percentile(100, kind):>8.1f}  {statuses}"
+            )
+    return "\n".join(lines)
+
+
+def _parse_routes(value: str) -> List[Tuple[str, str]]:
+    routes = []
+    for pair in value.split(","):
+        origin, _, destination = pair.strip().upper().partition("-")
+        if len(origin) != 3 or len(destination) != 3:
+            raise argparse.ArgumentTypeError(f"route must look like JFK-LAX, got {pair!r}")
+        routes.append((origin, destination))
+    return routes
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in REQUEST_KINDS:
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}; expected one of {', '.join(REQUEST_KINDS)}")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight for {kind} must be a number, got {weight!r}")
+    if not any(w > 0 for w in mix.values()):
+        raise argparse.ArgumentTypeError("at least one request kind needs a positive weight")
+    return mix
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test the SkyPath search API at increasing concurrency.")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process ASGI)")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=[1, 8, 32, 128],
+        help="Comma-separated concurrency levels (default: 1,8,32,128)",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Requests per level (default: 500)")
+    parser.add_argument(
+        "--routes",
+        type=_parse_routes,
+        default=DEFAULT_ROUTES,
+        help="Comma-separated ORIGIN-DEST pairs (default: JFK-LAX,SFO-NRT,BOS-SEA,SYD-LAX)",
+    )
+    parser.add_argument("--date", default=DEFAULT_DATE, help=f"Search date (default: {DEFAULT_DATE})")
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Request kind weights (default: search=0.85,invalid_airport=0.05,validation=0.05,server_error=0.05)",
+    )
+    parser.add_argument("--max-page", type=int, default=3, help="Pick page_number uniformly in [1, max-page]")
+    parser.add_argument("--seed", type=int, default=0, help="Request plan seed")
+    parser.add_argument(
+        "--prefix",
+        default=DEFAULT_PREFIX,
+        help=f"API path prefix, /v1/<SERVICE_NAME> of the target app (default: {DEFAULT_PREFIX})",
+    )
+    args = parser.parse_args(argv)
+    if args.url is not None and not any(w > 0 for kind, w in args.mix.items() if kind != "server_error"):
+        parser.error("--url runs cannot send server_error requests; give another kind a positive weight in --mix")
+
+    results = asyncio.run(
+        run_load(
+            concurrency_levels=args.concurrency,
+            requests_per_level=args.requests,
+            url=args.url,
+            routes=args.routes,
+            date=args.date,
+            mix=args.mix,
+            max_page=args.max_page,
+            seed=args.seed,
+            prefix=args.prefix,
+        )
+    )
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Utils - SkyPath backend
+"""
+Apply incremental schedule deltas (add / update / remove) to the in-memory index.
+
+Per-origin flight lists stay sorted by departure_utc: each change is a bisect
+lookup plus a single list insert/delete, instead of a full reload and re-sort.
+A batch never mutates the index searches are reading: affected per-origin lists
+and route counts are copied, and new top-level flights_from / routes_from maps
+(sharing every untouched list) are returned for the caller to publish, so a
+concurrent search sees either none or all of a batch.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import bisect
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from skypath_backend.utils.flight_loader import AirportInfo, Flight, build_flight
+
+DELTA_OPS = ("add", "update", "remove")
+
+
+@dataclass
+class DeltaResult:
+    """Outcome of one applied delta batch."""
+
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    affected_origins: Set[str] = field(default_factory=set)
+    flights_from: Dict[str, List[Flight]] = field(default_factory=dict)
+    routes_from: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def _departure_key(fl: Flight):
+    return fl.departure_utc
+
+
+def flight_to_raw(fl: Flight) -> dict:
+    """Return the flights.json representation of a Flight (local times as loaded)."""
+    return {
+        "flightNumber": fl.flight_number,
+        "airline": fl.airline,
+        "origin": fl.origin,
+        "destination": fl.destination,
+        "departureTime": fl.departure_local,
+        "arrivalTime": fl.arrival_local,
+        "price": fl.price,
+    }
+
+
+def _parse_flight(index: int, raw: dict, airport_map: Dict[str, AirportInfo]) -> Flight:
+    """Build a Flight for operation index, raising ValueError with the operation index on bad input."""
+    for key in ("origin", "destination", "departureTime", "arrivalTime", "price"):
+        if raw.get(key) is None:
+            raise ValueError(f"operation {index}: missing field {key}")
+    for key in ("origin", "destination"):
+        if raw[key] not in airport_map:
+            raise ValueError(f"operation {index}: unknown airport code {raw[key]}")
+    if raw["origin"] == raw["destination"]:
+        raise ValueError(f"operation {index}: origin and destination must be different")
+    try:
+        flight = build_flight(raw, airport_map)
+    except ValueError as exc:
+        raise ValueError(f"operation {index}: {exc}") from exc
+    if flight.arrival_utc <= flight.departure_utc:
+        raise ValueError(f"operation {index}: flight {flight.flight_number} must arrive after it departs")
+    if flight.price < 0:
+        raise ValueError(f"operation {index}: price must not be negative")
+    return flight
+
+
+def _remove_sorted(flights: List[Flight], fl: Flight) -> None:
+    """Remove fl (by identity) from a list sorted by departure_utc."""
+    i = bisect.bisect_left(flights, fl.departure_utc, key=_departure_key)
+    while flights[i] is not fl:
+        i += 1
+    del flights[i]
+
+
+def apply_flight_delta(
+    operations: List[dict],
+    airport_map: Dict[str, AirportInfo],
+    flights_from: Dict[str, List[Flight]],
+    flight_index: Dict[str, Flight],
+    routes_from: Dict[str, Dict[str, int]],
+) -> DeltaResult:
+    """
+    Apply a batch of add/update/remove operations, returning the new flight index maps.
+
+    The batch is validated as a whole before anything is changed, so an invalid
+    operation leaves the index untouched. Flights are identified by flightNumber.
+    "add" needs the full flight; "update" merges the given fields onto the
+    existing flight (e.g. only price, or new times for a retime); "remove" needs
+    only flightNumber.
+
+    Args:
+        operations: Dicts with "op", "flightNumber" and flights.json fields.
+        airport_map: IATA code -> AirportInfo (airports cannot be changed by deltas).
+        flights_from: Origin code -> list of Flight sorted by departure_utc; not modified.
+        flight_index: flightNumber -> Flight; updated in place (read only by delta writers).
+        routes_from: Origin code -> {destination code: flight count}; not modified.
+
+    Returns:
+        DeltaResult with per-op counts, the origins whose flight lists changed and
+        the new flights_from / routes_from maps to publish.
+
+    Raises:
+        ValueError: If any operation is unknown, references a missing/duplicate
+            flight, or carries invalid flight data.
+    """
+    result = DeltaResult()
+    staged: Dict[str, Optional[Flight]] = {}
+    for i, op in enumerate(operations):
+        kind = op.get("op")
+        number = op.get("flightNumber")
+        if kind not in DELTA_OPS:
+            raise ValueError(f"operation {i}: op must be one of {', '.join(DELTA_OPS)}")
+        if not number:
+            raise ValueError(f"operation {i}: missing field flightNumber")
+        existing = staged[number] if number in staged else flight_index.get(number)
+        fields = {k: v for k, v in op.items() if k != "op" and v is not None}
+        if kind == "add":
+            if existing is not None:
+                raise ValueError(f"operation {i}: flight {number} already exists")
+            staged[number] = _parse_flight(i, fields, airport_map)
+            result.added += 1
+        elif existing is None:
+            raise ValueError(f"operation {i}: flight {number} not found")
+        elif kind == "update":
+            staged[number] = _parse_flight(i, {**flight_to_raw(existing), **fields}, airport_map)
+            result.updated += 1
+        else:
+            staged[number] = None
+            result.removed += 1
+
+    new_lists: Dict[str, List[Flight]] = {}
+    new_routes: Dict[str, Dict[str, int]] = {}
+
+    def touch(origin: str) -> List[Flight]:
+        if origin not in new_lists:
+            new_lists[origin] = list(flights_from.get(origin, []))
+            new_routes[origin] = dict(routes_from.get(origin, {}))
+        return new_lists[origin]
+
+    for number, new in staged.items():
+        old = flight_index.get(number)
+        if old is not None:
+            _remove_sorted(touch(old.origin), old)
+            counts = new_routes[old.origin]
+            counts[old.destination] -= 1
+            if not counts[old.destination]:
+                del counts[old.destination]
+            del flight_index[number]
+        if new is not None:
+            bisect.insort(touch(new.origin), new, key=_departure_key)
+            counts = new_routes[new.origin]
+            counts[new.destination] = counts.get(new.destination, 0) + 1
+            flight_index[number] = new
+
+    result.flights_from = {**flights_from, **new_lists}
+    result.routes_from = {**routes_from, **new_routes}
+    result.affected_origins = set(new_lists)
+    return result
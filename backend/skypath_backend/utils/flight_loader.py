@@ -4,6 +4,7 @@ Load and preprocess flights.json at startup.
 Normalizes all times to UTC and builds airport map and flights-from-origin index.
 Responsibility: SkyPath Flight Connection Search.
 """
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -57,6 +58,84 @@ def _safe_float(value) -> float:
     return float(str(value).strip())
 
 
+def compute_data_version(data_path: Path) -> str:
+    """
+    Return a short content hash of the dataset file.
+
+    Used as the data version in HTTP ETags, so validators survive restarts as
+    long as flights.json is unchanged.
+
+    Args:
+        data_path: Path to flights.json.
+
+    Returns:
+        First 16 hex chars of the SHA-256 of the file contents.
+    """
+    return hashlib.sha256(data_path.read_bytes()).hexdigest()[:16]
+
+
+def build_flight(f: dict, airport_map: Dict[str, AirportInfo]) -> Flight:
+    """
+    Build a Flight from one raw flights.json record, converting local times to UTC.
+
+    Args:
+        f: Raw flight dict (flightNumber, origin, destination, departureTime, arrivalTime, price, airline).
+        airport_map: IATA code -> AirportInfo; must contain both origin and destination.
+
+    Returns:
+        Flight with naive UTC departure/arrival and float price.
+    """
+    origin_code = f["origin"]
+    dest_code = f["destination"]
+    origin_tz = airport_map[origin_code].timezone
+    dest_tz = airport_map[dest_code].timezone
+    dep_local = str(f["departureTime"])
+    arr_local = str(f["arrivalTime"])
+    dep_dt = datetime.fromisoformat(dep_local.replace("Z", "+00:00"))
+    arr_dt = datetime.fromisoformat(arr_local.replace("Z", "+00:00"))
+    if dep_dt.tzinfo is None:
+        dep_utc = dep_dt.replace(tzinfo=ZoneInfo(origin_tz)).astimezone(ZoneInfo("UTC"))
+    else:
+        dep_utc = dep_dt.astimezone(ZoneInfo("UTC"))
+    if arr_dt.tzinfo is None:
+        arr_utc = arr_dt.replace(tzinfo=ZoneInfo(dest_tz)).astimezone(ZoneInfo("UTC"))
+    else:
+        arr_utc = arr_dt.astimezone(ZoneInfo("UTC"))
+    return Flight(
+        flight_number=f["flightNumber"],
+        origin=origin_code,
+        destination=dest_code,
+        departure_utc=_to_utc_naive(dep_utc),
+        arrival_utc=_to_utc_naive(arr_utc),
+        price=_safe_float(f.get("price", 0)),
+        origin_country=airport_map[origin_code].country,
+        destination_country=airport_map[dest_code].country,
+        airline=f.get("airline", ""),
+        departure_local=dep_local,
+        arrival_local=arr_local,
+    )
+
+
+def build_routes_from(flights_from: Dict[str, List[Flight]]) -> Dict[str, Dict[str, int]]:
+    """
+    Build the route map: origin code -> {destination code: number of flights}.
+
+    Used to find which airports a search can depart from without scanning flight lists.
+
+    Args:
+        flights_from: Map of origin code -> list of Flight.
+
+    Returns:
+        Nested dict of flight counts per (origin, destination) route.
+    """
+    routes_from: Dict[str, Dict[str, int]] = {}
+    for origin, flights in flights_from.items():
+        counts = routes_from.setdefault(origin, {})
+        for fl in flights:
+            counts[fl.destination] = counts.get(fl.destination, 0) + 1
+    return routes_from
+
+
 def load_flights_and_airports(data_path: Path) -> tuple[Dict[str, AirportInfo], Dict[str, List[Flight]], List[dict]]:
     """
     Load flights.json, normalize times to UTC, build airport map and flights-from-origin index.
@@ -97,42 +176,9 @@ def load_flights_and_airports(data_path: Path) -> tuple[Dict[str, AirportInfo],
 
     flights: List[Flight] = []
     for f in flights_raw:
-        origin_code = f["origin"]
-        dest_code = f["destination"]
-        if origin_code not in airport_map or dest_code not in airport_map:
+        if f["origin"] not in airport_map or f["destination"] not in airport_map:
             continue
-        origin_tz = airport_map[origin_code].timezone
-        dest_tz = airport_map[dest_code].timezone
-        dep_local = str(f["departureTime"])
-        arr_local = str(f["arrivalTime"])
-        dep_dt = datetime.fromisoformat(dep_local.replace("Z", "+00:00"))
-        arr_dt = datetime.fromisoformat(arr_local.replace("Z", "+00:00"))
-        if dep_dt.tzinfo is None:
-            dep_utc = dep_dt.replace(tzinfo=ZoneInfo(origin_tz)).astimezone(ZoneInfo("UTC"))
-        else:
-            dep_utc = dep_dt.astimezone(ZoneInfo("UTC"))
-        if arr_dt.tzinfo is None:
-            arr_utc = arr_dt.replace(tzinfo=ZoneInfo(dest_tz)).astimezone(ZoneInfo("UTC"))
-        else:
-            arr_utc = arr_dt.astimezone(ZoneInfo("UTC"))
-        dep_utc_naive = _to_utc_naive(dep_utc)
-        arr_utc_naive = _to_utc_naive(arr_utc)
-        price = _safe_float(f.get("price", 0))
-        flights.append(
-            Flight(
-                flight_number=f["flightNumber"],
-                origin=origin_code,
-                destination=dest_code,
-                departure_utc=dep_utc_naive,
-                arrival_utc=arr_utc_naive,
-                price=price,
-                origin_country=airport_map[origin_code].country,
-                destination_country=airport_map[dest_code].country,
-                airline=f.get("airline", ""),
-                departure_local=dep_local,
-                arrival_local=arr_local,
-            )
-        )
+        flights.append(build_flight(f, airport_map))
 
     flights_from: Dict[str, List[Flight]] = {}
     for fl in flights:
@@ -0,0 +1,93 @@
+# Utils - SkyPath backend
+"""
+HTTP caching helpers: ETag / Last-Modified validators and 304 Not Modified handling.
+
+ETags are derived from the loaded data version plus a hash of the normalized
+request key, so they stay stable for the lifetime of a dataset and change as
+soon as the data does.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+def build_etag(data_version: str, *key_parts: object) -> str:
+    """
+    Build a weak ETag from the data version and the request key.
+
+    Weak validators are used because the same representation may be sent
+    brotli/gzip-encoded or identity-encoded depending on Accept-Encoding.
+
+    Args:
+        data_version: Version string of the currently loaded flight data.
+        key_parts: Normalized request parameters identifying the representation.
+
+    Returns:
+        ETag header value, e.g. W/"3f2a...-9c1b...".
+    """
+    key = "|".join(str(p) for p in key_parts)
+    key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{data_version}-{key_hash}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Format a POSIX timestamp as an RFC 7231 HTTP-date (for Last-Modified)."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: Optional[float], cache_control: str) -> Dict[str, str]:
+    """
+    Return validator, Cache-Control and Vary headers for a cacheable response.
+
+    Vary: Accept-Encoding is sent on every 200 and 304, not only on compressed
+    bodies, so a shared cache never serves a stored identity copy to clients
+    that asked for brotli/gzip (or the reverse).
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float]) -> bool:
+    """
+    Evaluate conditional request headers against the current validators.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 7232 §6); ETags
+    are compared with the weak comparison function.
+
+    Args:
+        request: Incoming request carrying If-None-Match / If-Modified-Since.
+        etag: Current ETag for the requested representation.
+        last_modified: POSIX timestamp of the last data change, if known.
+
+    Returns:
+        True if the client's cached copy is still valid and a 304 can be sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _strip_weak(etag)
+        return any(_strip_weak(tag.strip()) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Build an empty 304 Not Modified response carrying the given validators."""
+    return Response(status_code=304, headers=headers)
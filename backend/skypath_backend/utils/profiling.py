@@ -0,0 +1,186 @@
+# Utils - SkyPath backend
+"""
+Opt-in per-request sampling profiler.
+
+One shared background thread samples the Python stacks of the process while
+at least one profiled request is in flight, and attributes each sample:
+
+- Event-loop thread: a stack is counted for a request only if that request's
+  middleware frame is on it, i.e. the loop is running that request's task.
+- Other threads (threadpool workers running sync routes and single-flight
+  searches): the sampler cannot tell which request a worker serves, so these
+  stacks are counted for every profiled request in flight. With concurrent
+  profiled requests, worker samples are process-wide rather than per-request.
+
+Samples are written in folded-stack format, one line per distinct stack:
+
+    thread;module:function;module:function <count>
+
+ready for flamegraph.pl, speedscope or inferno. Idle stacks (threads blocked
+in threading/queue/selectors) and the sampler's own thread are dropped.
+Enabled through PROFILE_MODE; see constants.py.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = "x-profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+PROFILE_MODES = ("off", "header", "all")
+
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+_SAMPLER_THREAD_NAME = "skypath-profiler"
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}"
+
+
+def _frame_chain(frame) -> List:
+    """Return frames from leaf to root."""
+    chain = []
+    while frame is not None:
+        chain.append(frame)
+        frame = frame.f_back
+    return chain
+
+
+def fold_stack(chain: List, thread_name: str) -> Optional[str]:
+    """Return the folded (root-first, ';'-joined) stack for a leaf-first frame chain, or None if idle."""
+    if not chain or os.path.basename(chain[0].f_code.co_filename) in _IDLE_FILES:
+        return None
+    return ";".join([thread_name] + [_frame_label(f) for f in reversed(chain)])
+
+
+class RequestProfile:
+    """Samples collected for one request; owner_frame identifies its task on the loop thread."""
+
+    def __init__(self, loop_thread_id: int, owner_frame) -> None:
+        self.loop_thread_id = loop_thread_id
+        self.owner_frame = owner_frame
+        self.samples: Counter = Counter()
+
+
+class SharedSampler:
+    """One sampling thread for all profiled requests; runs only while some profile is registered."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._active: Dict[int, RequestProfile] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active[id(profile)] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=_SAMPLER_THREAD_NAME, daemon=True)
+                self._thread.start()
+
+    def unregister(self, profile: RequestProfile) -> Counter:
+        """Stop collecting for profile and return a snapshot of its samples (idempotent)."""
+        with self._lock:
+            self._active.pop(id(profile), None)
+            return Counter(profile.samples)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval_s)
+            names: Dict[int, str] = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    chain = _frame_chain(frame)
+                    stack = fold_stack(chain, names.get(thread_id, str(thread_id)))
+                    if stack is None:
+                        continue
+                    for profile in self._active.values():
+                        if thread_id != profile.loop_thread_id or any(f is profile.owner_frame for f in chain):
+                            profile.samples[stack] += 1
+
+
+def write_folded(samples: Counter, path: Path) -> None:
+    """Write samples in folded-stack format, heaviest stacks first."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in samples.most_common()))
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests and dump folded stacks for the slow ones.
+
+    mode "header" profiles only requests sent with "X-Profile: <token>"; mode
+    "all" profiles every request. Profiling stops when the response starts. A
+    profile is written (off the event loop) when the request took at least
+    slow_ms to reach that point, or always if it asked via the header, and the
+    file name (not the server path) is returned in the X-Profile-File header.
+    With an empty token the header is never honoured, so clients cannot force
+    profiles to disk.
+    """
+
+    def __init__(
+        self, app: ASGIApp, mode: str, slow_ms: float, output_dir: str, interval_ms: float, token: str = ""
+    ) -> None:
+        if mode not in ("header", "all"):
+            raise ValueError("ProfilingMiddleware mode must be header or all")
+        self.app = app
+        self.mode = mode
+        self.token = token.encode("utf-8")
+        self.slow_ms = slow_ms
+        self.output_dir = Path(output_dir)
+        self.sampler = SharedSampler(interval_ms / 1000.0)
+
+    def _is_requested(self, value: Optional[str]) -> bool:
+        """Whether the X-Profile header carries the token (constant-time comparison)."""
+        return bool(self.token) and value is not None and secrets.compare_digest(value.encode("utf-8"), self.token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self._is_requested(Headers(scope=scope).get(PROFILE_HEADER))
+        if self.mode == "header" and not requested:
+            await self.app(scope, receive, send)
+            return
+
+        # This coroutine's frame is on the loop thread's stack whenever the request's task runs
+        profile = RequestProfile(threading.get_ident(), sys._getframe())
+        self.sampler.register(profile)
+        start = time.perf_counter()
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                samples = self.sampler.unregister(profile)
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                if samples and (requested or elapsed_ms >= self.slow_ms):
+                    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+                    path = self.output_dir / (
+                        f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{elapsed_ms:.0f}ms-{uuid.uuid4().hex[:8]}.folded"
+                    )
+                    await run_in_threadpool(write_folded, samples, path)
+                    MutableHeaders(scope=message).append(PROFILE_FILE_HEADER, path.name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            self.sampler.unregister(profile)
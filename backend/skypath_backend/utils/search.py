@@ -3,7 +3,7 @@ DFS-based itinerary search with connection rules.
 
 Responsibility: SkyPath Flight Connection Search.
 """
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from skypath_backend.constants import (
     MAX_LAYOVER_MIN,
@@ -129,3 +129,26 @@ def search_itineraries(
 
     results.sort(key=lambda x: x["totalDurationMinutes"])
     return results
+
+
+def departure_airports(origin: str, routes_from: Dict[str, Dict[str, int]]) -> Set[str]:
+    """
+    Return the airports any leg of a search from origin can depart from.
+
+    That is origin plus every airport reachable within MAX_STOPS hops. Only
+    changes to flights departing these airports can change the search result,
+    so this set scopes cache invalidation after schedule deltas.
+
+    Args:
+        origin: Origin airport IATA code.
+        routes_from: Map of origin code -> {destination code: flight count}.
+
+    Returns:
+        Set of IATA codes.
+    """
+    airports = {origin}
+    frontier = {origin}
+    for _ in range(MAX_STOPS):
+        frontier = {dest for code in frontier for dest in routes_from.get(code, {})} - airports
+        airports |= frontier
+    return airports
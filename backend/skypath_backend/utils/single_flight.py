@@ -0,0 +1,110 @@
+# Utils - SkyPath backend
+"""
+Single-flight request coalescing.
+
+Concurrent calls with the same key share one execution and its result (or
+exception). Works for callers on threadpool threads (sync routes) and on the
+event loop (async routes); both wait on the same concurrent.futures.Future.
+Responsibility: SkyPath Flight Connection Search.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """Deduplicates concurrent identical calls and counts how many were coalesced."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._executions = 0
+        self._coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller is the leader."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._executions += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, exc: BaseException | None = None) -> None:
+        """Drop key from the in-flight map, then publish the outcome to waiters."""
+        with self._lock:
+            self._calls.pop(key, None)
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key (blocking).
+
+        Args:
+            key: Identity of the computation (e.g. normalized search parameters).
+            fn: Zero-argument callable doing the work.
+
+        Returns:
+            The result of fn, shared by every caller that joined while it ran.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key, future, exc=exc)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def _run_leader(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> None:
+        """Run fn on the threadpool and publish the outcome; never raises, so the task result is always consumed."""
+        try:
+            result = await run_in_threadpool(fn)
+        except BaseException as exc:
+            self._finish(key, future, exc=exc)
+            return
+        self._finish(key, future, result=result)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Async variant of do(): fn runs once on the threadpool, waiters never block the loop.
+
+        The leader schedules the computation as a separate task and then waits on
+        the shared future like every other caller, so a cancelled (disconnected)
+        caller neither cancels the computation nor leaves its outcome unobserved.
+
+        Args:
+            key: Identity of the computation (e.g. normalized search parameters).
+            fn: Zero-argument blocking callable doing the work.
+
+        Returns:
+            The result of fn, shared by every caller that joined while it ran.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._run_leader(key, future, fn))
+            # Keep a strong reference until the task finishes, even if every caller is cancelled
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters: executions (leaders), coalesced (joined waiters), in_flight keys."""
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }